@@ -1,20 +1,38 @@
-import json
-import requests
+import httpx
+import orjson
 import yaml
 
+try:
+    # LibYAML C loader, typically ~10x faster than the pure-Python loader
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+def normalize(x):
+    """Normalize YAML-loaded data to JSON-native types (tuples to lists).
+
+    A single recursive walk replaces the previous
+    json.loads(json.dumps(...)) round-trip, which serialized and reparsed
+    the whole spec just to coerce container types.
+    """
+    if isinstance(x, dict):
+        return {k: normalize(v) for k, v in x.items()}
+    if isinstance(x, (list, tuple)):
+        return [normalize(v) for v in x]
+    return x
+
+
 # Fetch the OpenAPI JSON schema from the running FastAPI application
-response = requests.get("http://127.0.0.1:8000/openapi.json")
-openapi_json = response.json()
+with httpx.Client() as client:
+    response = client.get("http://127.0.0.1:8000/openapi.json")
+openapi_json = orjson.loads(response.content)
 
 # Load the local openapi.yaml file
 with open("doc/openapi.yaml", "r", encoding="utf-8") as f:
-    openapi_yaml = yaml.safe_load(f)
-
-# Convert the YAML to JSON for comparison
-openapi_yaml_json = json.loads(json.dumps(openapi_yaml))
+    openapi_yaml = yaml.load(f, Loader=SafeLoader)
 
 # Compare the two schemas
-if openapi_json == openapi_yaml_json:
+if openapi_json == normalize(openapi_yaml):
     print("The OpenAPI specification matches the implementation")
 else:
     print("The OpenAPI specification does not match the implementation")